@@ -1,14 +1,19 @@
+import os
 import pickle
+import sys
+import uuid
 import logging
-from datetime import datetime, date, timedelta
-from collections import UserDict
-from typing import List, Optional
+from datetime import datetime, date
+from typing import Dict, List, Optional, Set, Tuple
 from colorama import Fore, Style, init
 
 # -------------------------------------------------------------------
 # 1. Налаштування Colorama і логування
 # -------------------------------------------------------------------
-init(autoreset=True)
+# Кольори потрібні лише в терміналі; при виводі у канал/файл colorama не обгортає stdout
+COLOR_OUTPUT = sys.stdout.isatty()
+if COLOR_OUTPUT:
+    init(autoreset=True)
 logging.basicConfig(
     filename="addressbook.log",
     level=logging.ERROR,
@@ -16,6 +21,29 @@ logging.basicConfig(
 )
 
 PICKLE_FILE = "addressbook.pkl"
+JOURNAL_SUFFIX = ".journal"  # журнал змін знімка <файл>.journal, накопичених після його збереження
+IO_BUFFER_SIZE = 1 << 20  # 1 МБ: pickle читає/пише дрібними шматками
+# На скільки днів переноситься привітання залежно від weekday(): субота -> +2, неділя -> +1
+WEEKDAY_SHIFT = (0, 0, 0, 0, 0, 2, 1)
+
+# Кольори і незмінні повідомлення складаються один раз під час імпорту
+if COLOR_OUTPUT:
+    RED, YELLOW, CYAN, RESET = Fore.RED, Fore.YELLOW, Fore.CYAN, Style.RESET_ALL
+else:
+    RED = YELLOW = CYAN = RESET = ""
+MSG_NOT_FOUND = RED + "Контакт з таким іменем не знайдено." + RESET
+MSG_BAD_ARGS = RED + "Неправильний формат команди або недостатньо аргументів." + RESET
+MSG_UNKNOWN_COMMAND = CYAN + "Невідома команда. Спробуйте 'help' для перегляду доступних команд." + RESET
+HELP_TEXT = (YELLOW + "Підтримувані команди:\n" + RESET +
+             "  hello\n"
+             "  add [name] [phone]\n"
+             "  change [name] [old_phone] [new_phone]\n"
+             "  phone [name]\n"
+             "  all\n"
+             "  add-birthday [name] [DD.MM.YYYY]\n"
+             "  show-birthday [name]\n"
+             "  birthdays\n"
+             "  close або exit (для завершення)\n")
 
 
 # -------------------------------------------------------------------
@@ -31,16 +59,16 @@ def input_error(func):
             return func(*args, **kwargs)
         except KeyError as e:
             logging.error(f"KeyError in {func.__name__}: {e}")
-            print(Fore.RED + "Контакт з таким іменем не знайдено." + Style.RESET_ALL)
+            print(MSG_NOT_FOUND)
         except ValueError as e:
             logging.error(f"ValueError in {func.__name__}: {e}")
-            print(Fore.RED + f"{e}" + Style.RESET_ALL)
+            print(f"{RED}{e}{RESET}")
         except IndexError:
             logging.error(f"IndexError in {func.__name__}: Not enough arguments.")
-            print(Fore.RED + "Неправильний формат команди або недостатньо аргументів." + Style.RESET_ALL)
+            print(MSG_BAD_ARGS)
         except Exception as e:
             logging.error(f"Unexpected error in {func.__name__}: {e}", exc_info=True)
-            print(Fore.RED + f"Сталася несподівана помилка: {e}" + Style.RESET_ALL)
+            print(f"{RED}Сталася несподівана помилка: {e}{RESET}")
     return wrapper
 
 
@@ -49,44 +77,87 @@ def input_error(func):
 # -------------------------------------------------------------------
 class Field:
     """Базовий клас для усіх полів (Name, Phone, Birthday)."""
+    __slots__ = ("value",)
+
     def __init__(self, value):
         self.value = value
 
+    def __getstate__(self):
+        return (self.value,)
+
+    def __setstate__(self, state):
+        if isinstance(state, dict):  # файли, збережені до появи __slots__
+            state = (state["value"],)
+        (self.value,) = state
+
     def __str__(self):
         return str(self.value)
 
 
 class Name(Field):
-    """Ім'я контакту (обов'язкове поле)."""
-    pass
+    """Ім'я контакту (обов'язкове поле). Рядок інтернується, щоб однакові імена не дублювалися."""
+    __slots__ = ()
+
+    def __init__(self, value: str):
+        super().__init__(sys.intern(value))
+
+    def __setstate__(self, state):
+        super().__setstate__(state)
+        self.value = sys.intern(self.value)
 
 
 class Phone(Field):
     """
     Зберігає номер телефону і перевіряє, що він складається рівно з 10 цифр.
+    Рядок інтернується: однаковий номер у різних контактах — один об'єкт у пам'яті і в pickle.
     """
+    __slots__ = ()
+
     def __init__(self, value: str):
         if not isinstance(value, str):
             raise ValueError("Телефон має бути рядком, що містить 10 цифр.")
-        if not (value.isdigit() and len(value) == 10):
+        # isascii() перевіряє лише прапорець рядка, тож нестандартні (не ASCII) цифри
+        # відсікаються ще до посимвольної перевірки isdigit()
+        if not (len(value) == 10 and value.isascii() and value.isdigit()):
             raise ValueError("Телефонний номер повинен складатися рівно з 10 цифр.")
-        super().__init__(value)
+        super().__init__(sys.intern(value))
+
+    def __setstate__(self, state):
+        super().__setstate__(state)
+        self.value = sys.intern(self.value)
 
 
 class Birthday(Field):
     """
     Зберігає день народження як datetime.date.
     Рядок повинен бути у форматі DD.MM.YYYY.
+    Додатково кешує _mmdd = місяць * 100 + день для швидкого порівняння дат.
     """
+    __slots__ = ("_mmdd",)
+
     def __init__(self, value: str):
         try:
-            parsed = datetime.strptime(value, "%d.%m.%Y").date()
+            parsed = self._parse(value)
         except ValueError:
             raise ValueError("Дата повинна бути у форматі DD.MM.YYYY і бути коректною датою.")
         super().__init__(parsed)
+        self._mmdd = parsed.month * 100 + parsed.day
+
+    @staticmethod
+    def _parse(value: str) -> date:
+        """Розбирає DD.MM.YYYY вручну; інші записи (напр. 1.2.2000) — через strptime."""
+        if (len(value) == 10 and value.isascii() and value[2] == "." and value[5] == "."
+                and value[0:2].isdigit() and value[3:5].isdigit() and value[6:10].isdigit()):
+            return date(int(value[6:10]), int(value[3:5]), int(value[0:2]))
+        return datetime.strptime(value, "%d.%m.%Y").date()
+
+    def __setstate__(self, state):
+        super().__setstate__(state)
+        self._mmdd = self.value.month * 100 + self.value.day
 
     def __str__(self):
-        return self.value.strftime("%d.%m.%Y")
+        v = self.value
+        return f"{v.day:02d}.{v.month:02d}.{v.year:04d}"
 
 
 class Record:
@@ -95,33 +166,60 @@ class Record:
     - Name (обов'язкове)
     - Список Phone
     - Опціонально Birthday
+    Множина _phone_set дублює значення з phones для перевірки наявності номера за O(1).
     """
+    __slots__ = ("name", "phones", "birthday", "_phone_set")
+
     def __init__(self, name: str):
         self.name = Name(name)
         self.phones: List[Phone] = []
         self.birthday: Optional[Birthday] = None
+        self._phone_set: Set[str] = set()
+
+    def __getstate__(self):
+        return (self.name, self.phones, self.birthday)
+
+    def __setstate__(self, state):
+        if isinstance(state, dict):  # файли, збережені до появи __slots__
+            state = (state["name"], state["phones"], state["birthday"])
+        self.name, self.phones, self.birthday = state
+        self._phone_set = {ph.value for ph in self.phones}
+
+    def _phone_index(self, phone_str: str) -> int:
+        for idx, ph in enumerate(self.phones):
+            if ph.value == phone_str:
+                return idx
+        raise ValueError(phone_str)
 
     def add_phone(self, phone_str: str):
         """Додає номер телефону, якщо він ще не доданий."""
         phone_obj = Phone(phone_str)
-        if not any(p.value == phone_obj.value for p in self.phones):
-            self.phones.append(phone_obj)
+        if phone_obj.value in self._phone_set:
+            return
+        self._phone_set.add(phone_obj.value)
+        self.phones.append(phone_obj)
 
     def remove_phone(self, phone_str: str):
         """Видаляє номер телефону, якщо він є."""
-        for ph in self.phones:
-            if ph.value == phone_str:
-                self.phones.remove(ph)
-                break
+        if phone_str not in self._phone_set:
+            return
+        self._phone_set.discard(phone_str)
+        del self.phones[self._phone_index(phone_str)]
 
     def edit_phone(self, old_phone: str, new_phone: str):
         """Замінює старий номер на новий, якщо старий знайдено."""
-        for idx, ph in enumerate(self.phones):
-            if ph.value == old_phone:
-                new_phone_obj = Phone(new_phone)
-                self.phones[idx] = new_phone_obj
-                return True
-        return False
+        if old_phone not in self._phone_set:
+            return False
+        new_phone_obj = Phone(new_phone)
+        idx = self._phone_index(old_phone)
+        self._phone_set.discard(old_phone)
+        if new_phone_obj.value in self._phone_set:
+            # новий номер уже є у контакті — просто прибираємо старий, без дубліката
+            del self.phones[idx]
+        else:
+            self.phones[idx] = new_phone_obj
+            self._phone_set.add(new_phone_obj.value)
+        return True
 
     def add_birthday(self, bday_str: str):
         """Встановлює або оновлює день народження."""
@@ -134,28 +232,141 @@ class Record:
         return "День народження не задано"
 
     def __str__(self):
-        phones_str = ", ".join(ph.value for ph in self.phones)
+        phones_str = ", ".join([ph.value for ph in self.phones])
         if self.birthday:
             return f"{self.name.value}: {phones_str}, birthday: {self.birthday}"
         return f"{self.name.value}: {phones_str}"
 
 
-class AddressBook(UserDict):
+class AddressBook(dict):
     """
     Адресна книга як контейнер записів (Record), де ключ — ім'я контакту.
+    Якщо відкрито журнал (open_journal), кожна зміна дописується до нього одним записом.
+    generation — ідентифікатор останнього знімка книги; журнал починається з нього,
+    тож журнал від іншого знімка розпізнається і не застосовується.
+    Індекс _ci (ім'я в нижньому регістрі -> множина імен-ключів) дозволяє шукати контакт
+    без огляду на регістр.
     """
+    _journal = None  # файл журналу; у pickle не потрапляє
+    _journal_snapshot = None  # знімок, до якого належить відкритий журнал
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._rebuild_index()
+        self.generation: Optional[str] = uuid.uuid4().hex
+
+    def __reduce__(self):
+        # лише записи і generation — службові атрибути (журнал тощо) у pickle не потрапляють
+        return (AddressBook, (), {"generation": self.generation}, None, iter(self.items()))
+
+    def __setstate__(self, state):
+        # книги, збережені ще як UserDict, тримають записи у state["data"] і не мають generation
+        self.update(state.get("data", {}))
+        self._rebuild_index()
+        self.generation = state.get("generation")
+
+    def _rebuild_index(self):
+        self._ci: Dict[str, Set[str]] = {}
+        for name in self:
+            self._ci.setdefault(name.lower(), set()).add(name)
+
+    def open_journal(self, filename: str, header: Optional[tuple], valid_size: int):
+        """
+        Відкриває журнал змін знімка filename для дозапису (без буферизації — запис одразу йде у файл).
+        header і valid_size — результат replay_journal: журнал іншого знімка очищається,
+        а обірваний останній запис відкидається.
+        """
+        self._journal = open(filename + JOURNAL_SUFFIX, "ab", buffering=0)
+        self._journal_snapshot = filename
+        if header != ("generation", self.generation):
+            self.clear_journal()
+        else:
+            self._journal.truncate(valid_size)
+
+    def close_journal(self):
+        if self._journal is not None:
+            self._journal.close()
+            self._journal = None
+            self._journal_snapshot = None
+
+    def log_change(self, *change):
+        """Дописує зміну, напр. ("add_phone", name, phone), до журналу одним викликом write()."""
+        if self._journal is not None:
+            self._journal.write(pickle.dumps(change, protocol=pickle.HIGHEST_PROTOCOL))
+
+    def clear_journal(self):
+        """Починає журнал заново: лише заголовок з generation поточного знімка."""
+        if self._journal is not None:
+            self._journal.truncate(0)
+            self.log_change("generation", self.generation)
+
+    def snapshot_saved(self, filename: str):
+        """Після збереження знімка filename його журнал (відкритий чи від попередньої книги) більше не потрібен."""
+        if self._journal_snapshot == filename:
+            self.clear_journal()
+            return
+        try:
+            os.remove(filename + JOURNAL_SUFFIX)
+        except FileNotFoundError:
+            pass
+
+    def apply_change(self, change: tuple):
+        """Застосовує до книги одну зміну з журналу."""
+        op, *params = change
+        if op == "add_phone":
+            name, phone = params
+            self.add_phone(name, phone)
+        elif op == "edit_phone":
+            name, old_phone, new_phone = params
+            self.find(name).edit_phone(old_phone, new_phone)
+        elif op == "add_birthday":
+            name, bday_str = params
+            self.find(name).add_birthday(bday_str)
+        else:
+            raise ValueError(f"Unknown journal operation: {op!r}")
+
+    def add_phone(self, name: str, phone: str) -> Tuple[Record, bool]:
+        """Додає номер контакту name, а якщо такого контакту немає — створює його. Повертає (запис, чи створено)."""
+        record = self.try_find(name)
+        if record is None:
+            record = Record(name)
+            record.add_phone(phone)
+            self.add_record(record)
+            return record, True
+        record.add_phone(phone)
+        return record, False
+
     def add_record(self, record: Record):
-        self.data[record.name.value] = record
+        self[record.name.value] = record
+        self._ci.setdefault(record.name.value.lower(), set()).add(record.name.value)
+
+    def try_find(self, name: str) -> Optional[Record]:
+        """Шукає контакт за точним ім'ям, а якщо такого немає — без огляду на регістр. Інакше None."""
+        rec = self.get(name)
+        if rec is None:
+            # записи, змінені в обхід add_record/delete (del, pop тощо), вважаються відсутніми
+            for canonical in self._ci.get(name.lower(), ()):
+                rec = self.get(canonical)
+                if rec is not None:
+                    break
+        return rec
 
     def find(self, name: str) -> Record:
-        rec = self.data.get(name)
+        """Як try_find, але для відсутнього контакту піднімає KeyError."""
+        rec = self.try_find(name)
         if rec is None:
             raise KeyError(f"{name} not found in AddressBook.")
         return rec
 
     def delete(self, name: str) -> bool:
-        if name in self.data:
-            del self.data[name]
+        if name in self:
+            del self[name]
+            lowered = name.lower()
+            names = self._ci.get(lowered)
+            if names is not None:
+                names.discard(name)
+                if not names:
+                    del self._ci[lowered]
             return True
         return False
 
@@ -164,111 +375,175 @@ class AddressBook(UserDict):
         Повертає список записів, у яких день народження протягом наступних 7 днів.
         Якщо ДН припадає на вихідні, переносить привітання на наступний понеділок.
         """
-        today = date.today()
-        upcoming = []
-        for record in self.data.values():
-            if record.birthday is None:
-                continue
-            bday: date = record.birthday.value
-            birthday_this_year = bday.replace(year=today.year)
-            if birthday_this_year < today:
-                birthday_this_year = birthday_this_year.replace(year=today.year + 1)
-            days_ahead = (birthday_this_year - today).days
-            if 0 <= days_ahead <= 6:
-                if birthday_this_year.weekday() == 5:  # субота
-                    congratulation_date = birthday_this_year + timedelta(days=2)
-                elif birthday_this_year.weekday() == 6:  # неділя
-                    congratulation_date = birthday_this_year + timedelta(days=1)
-                else:
-                    congratulation_date = birthday_this_year
-                upcoming.append({
-                    "name": record.name.value,
-                    "congratulation_date": congratulation_date.strftime("%Y.%m.%d")
-                })
-        return upcoming
+        today_ord = date.today().toordinal()
+        # MMDD кожного з найближчих 7 днів (з урахуванням переходу року) -> готова дата привітання
+        window = {}
+        for day_ord in range(today_ord, today_ord + 7):
+            day = date.fromordinal(day_ord)
+            c = date.fromordinal(day_ord + WEEKDAY_SHIFT[day.weekday()])
+            window[day.month * 100 + day.day] = f"{c.year:04d}.{c.month:02d}.{c.day:02d}"
+        # сам прохід по книзі — один comprehension із локально прив'язаним window.get
+        lookup = window.get
+        return [
+            {"name": record.name.value, "congratulation_date": congratulation_date}
+            for record in self.values()
+            if record.birthday is not None
+            and (congratulation_date := lookup(record.birthday._mmdd)) is not None
+        ]
 
 
 # -------------------------------------------------------------------
 # 4. Функції для збереження/завантаження даних за допомогою pickle
 # -------------------------------------------------------------------
 def save_data(book: AddressBook, filename: str = PICKLE_FILE):
-    """Зберігає AddressBook у файл за допомогою pickle."""
-    with open(filename, "wb") as f:
-        pickle.dump(book, f)
+    """
+    Зберігає AddressBook у файл за допомогою pickle.
+    Спершу пише у тимчасовий файл і лише потім атомарно підміняє ним основний,
+    тож збій посеред запису не зіпсує попередню версію книги.
+    Кожен знімок отримує нове generation, а журнал цього файлу починається заново.
+    """
+    previous_generation = book.generation
+    book.generation = uuid.uuid4().hex
+    tmp_filename = filename + ".tmp"
+    try:
+        with open(tmp_filename, "wb", buffering=IO_BUFFER_SIZE) as f:
+            pickle.dump(book, f, protocol=pickle.HIGHEST_PROTOCOL)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_filename, filename)
+    except BaseException:
+        book.generation = previous_generation
+        try:
+            os.remove(tmp_filename)
+        except FileNotFoundError:
+            pass
+        raise
+    book.snapshot_saved(filename)
 
 
 def load_data(filename: str = PICKLE_FILE) -> AddressBook:
-    """Завантажує AddressBook з файлу. Якщо файл не знайдено, повертає порожню книгу."""
+    """
+    Завантажує AddressBook з файлу і застосовує зміни з його журналу, не збережені у знімку
+    (наприклад, якщо програма завершилася без команди exit); далі зміни дописуються в той самий журнал.
+    Якщо файл не знайдено, повертає порожню книгу.
+    """
     try:
-        with open(filename, "rb") as f:
-            return pickle.load(f)
+        with open(filename, "rb", buffering=IO_BUFFER_SIZE) as f:
+            book = pickle.load(f)
     except FileNotFoundError:
-        print(Fore.YELLOW + f"Файл {filename} не знайдено. Створено нову адресну книгу." + Style.RESET_ALL)
-        return AddressBook()
+        print(f"{YELLOW}Файл {filename} не знайдено. Створено нову адресну книгу.{RESET}")
+        book = AddressBook()
+        book.generation = None  # як і в знімків без generation: журнал без знімка теж відновлюємо
+    header, valid_size = replay_journal(book, filename)
+    book.open_journal(filename, header, valid_size)
+    return book
+
+
+def read_journal(journal_filename: str):
+    """Повертає пари (запис, позиція його кінця) з журналу до кінця файлу або першого пошкодженого запису."""
+    try:
+        f = open(journal_filename, "rb", buffering=IO_BUFFER_SIZE)
+    except FileNotFoundError:
+        return
+    with f:
+        while True:
+            try:
+                entry = pickle.load(f)
+            except Exception:
+                # кінець журналу або обірваний/пошкоджений запис (збій посеред дозапису)
+                break
+            yield entry, f.tell()
+
+
+def replay_journal(book: AddressBook, filename: str = PICKLE_FILE) -> Tuple[Optional[tuple], int]:
+    """
+    Застосовує до книги зміни з журналу знімка filename.
+    Журнал, що належить іншому знімку (інше generation), ігнорується.
+    Повертає заголовок журналу і розмір його неушкодженої частини (для open_journal).
+    """
+    journal_filename = filename + JOURNAL_SUFFIX
+    entries = read_journal(journal_filename)
+    first = next(entries, None)
+    if first is None:
+        return None, 0
+    header, valid_size = first
+    if header != ("generation", book.generation):
+        return header, 0
+    failed = 0
+    for change, valid_size in entries:
+        try:
+            book.apply_change(change)
+        except (KeyError, ValueError, TypeError) as e:
+            failed += 1
+            logging.error(f"Journal replay failed for {change!r}: {e}")
+    if failed:
+        print(f"{YELLOW}Не вдалося відновити з журналу {journal_filename} змін: {failed}. "
+              f"Подробиці — у addressbook.log.{RESET}")
+    return header, valid_size
 
 
 # -------------------------------------------------------------------
 # 5. Функції-обробники команд
 # -------------------------------------------------------------------
 @input_error
-def add_contact(args: list, book: AddressBook) -> str:
+def add_contact(args: str, book: AddressBook) -> str:
     """add [name] [phone] – додає новий контакт або номер до існуючого."""
-    name, phone = args[0], args[1]
-    try:
-        record = book.find(name)
-        record.add_phone(phone)
-        return f"Для контакту {name} додано номер {phone}."
-    except KeyError:
-        record = Record(name)
-        record.add_phone(phone)
-        book.add_record(record)
+    parts = args.split(None, 2)
+    name, phone = parts[0], parts[1]
+    record, created = book.add_phone(name, phone)
+    book.log_change("add_phone", record.name.value, phone)
+    if created:
         return f"Створено новий контакт: {name} з номером {phone}."
+    return f"Для контакту {name} додано номер {phone}."
 
 
 @input_error
-def change_phone(args: list, book: AddressBook) -> str:
+def change_phone(args: str, book: AddressBook) -> str:
     """change [name] [old_phone] [new_phone] – змінює номер телефону."""
-    name, old_phone, new_phone = args[0], args[1], args[2]
+    parts = args.split(None, 3)
+    name, old_phone, new_phone = parts[0], parts[1], parts[2]
     record = book.find(name)
     changed = record.edit_phone(old_phone, new_phone)
     if changed:
+        book.log_change("edit_phone", record.name.value, old_phone, new_phone)
         return f"У {name} замінено номер {old_phone} на {new_phone}."
     return f"У {name} не знайдено номер {old_phone}."
 
 
 @input_error
-def show_phones(args: list, book: AddressBook) -> str:
+def show_phones(args: str, book: AddressBook) -> str:
     """phone [name] – показує всі номери телефону для контакту."""
-    name = args[0]
+    name = args.split(None, 1)[0]
     record = book.find(name)
     if not record.phones:
         return f"У {name} немає телефонних номерів."
-    phones_str = ", ".join(ph.value for ph in record.phones)
+    phones_str = ", ".join([ph.value for ph in record.phones])
     return f"Контакт {name}, телефони: {phones_str}"
 
 
 @input_error
-def show_all(args: list, book: AddressBook) -> str:
+def show_all(args: str, book: AddressBook) -> str:
     """all – показує всі контакти в адресній книзі."""
-    if not book.data:
+    if not book:
         return "Адресна книга порожня."
-    lines = [str(record) for record in book.data.values()]
-    return "\n".join(lines)
+    return "\n".join(map(str, book.values()))
 
 
 @input_error
-def add_birthday(args: list, book: AddressBook) -> str:
+def add_birthday(args: str, book: AddressBook) -> str:
     """add-birthday [name] [DD.MM.YYYY] – встановлює день народження для контакту."""
-    name, bday_str = args[0], args[1]
+    parts = args.split(None, 2)
+    name, bday_str = parts[0], parts[1]
     record = book.find(name)
     record.add_birthday(bday_str)
+    book.log_change("add_birthday", record.name.value, bday_str)
     return f"Для {name} встановлено день народження: {bday_str}"
 
 
 @input_error
-def show_birthday(args: list, book: AddressBook) -> str:
+def show_birthday(args: str, book: AddressBook) -> str:
     """show-birthday [name] – показує день народження контакту."""
-    name = args[0]
+    name = args.split(None, 1)[0]
     record = book.find(name)
     bday_info = record.show_birthday()
     if bday_info == "День народження не задано":
@@ -277,7 +552,7 @@ def show_birthday(args: list, book: AddressBook) -> str:
 
 
 @input_error
-def show_upcoming_birthdays(args: list, book: AddressBook) -> str:
+def show_upcoming_birthdays(args: str, book: AddressBook) -> str:
     """
     birthdays – показує, у кого день народження протягом наступних 7 днів,
     з переносом привітання на понеділок, якщо необхідно.
@@ -286,76 +561,114 @@ def show_upcoming_birthdays(args: list, book: AddressBook) -> str:
     if not upcoming:
         return "На наступному тижні немає іменинників."
     lines = ["Ось хто святкує День народження протягом наступних 7 днів:"]
-    for person in upcoming:
-        lines.append(f"{person['name']} => {person['congratulation_date']}")
+    lines += [f"{person['name']} => {person['congratulation_date']}" for person in upcoming]
     return "\n".join(lines)
 
 
 @input_error
-def greet(args: list, book: AddressBook) -> str:
+def greet(args: str, book: AddressBook) -> str:
     """hello – виводить привітальне повідомлення."""
     return "Привіт! Чим можу допомогти?"
 
 
+@input_error
+def show_help(args: str, book: AddressBook) -> str:
+    """help – показує список підтримуваних команд."""
+    return HELP_TEXT
+
+
+def close_book(args: str, book: AddressBook) -> None:
+    """close / exit – зберігає книгу перед завершенням роботи."""
+    print("До побачення! Зберігаю книгу...")
+    save_data(book, PICKLE_FILE)
+    book.close_journal()
+
+
+COMMANDS = {
+    "add": add_contact,
+    "change": change_phone,
+    "phone": show_phones,
+    "all": show_all,
+    "add-birthday": add_birthday,
+    "show-birthday": show_birthday,
+    "birthdays": show_upcoming_birthdays,
+    "hello": greet,
+    "help": show_help,
+    "close": close_book,
+    "exit": close_book,
+}
+
+
 # -------------------------------------------------------------------
 # 6. Головна функція main() з циклом командного інтерфейсу
 # -------------------------------------------------------------------
+def read_commands(interactive: bool):
+    """
+    Повертає рядки команд до кінця вводу.
+    У терміналі читає через input() із запрошенням ">>> ", а з каналу/файлу —
+    просто ітерує sys.stdin, без запрошень.
+    """
+    if not interactive:
+        yield from sys.stdin
+        return
+    while True:
+        try:
+            yield input(">>> ")
+        except EOFError:
+            return
+
+
 def main():
     """
     Головна точка входу.
     Завантажує (або створює) AddressBook з файлу pickle, запускає цикл вводу команд,
-    а перед виходом зберігає дані.
+    а перед виходом (команда exit/close або кінець вводу) зберігає дані.
+    Зміни між збереженнями дописуються у журнал, тож не губляться при аварійному завершенні.
     """
-    choice = input("Load existing address book from pickle? (y/n): ").strip().lower()
+    interactive = sys.stdin.isatty()
+    # якщо ввід скінчився ще до відповіді, виходимо без змін у книзі на диску
+    if interactive:
+        try:
+            choice = input("Load existing address book from pickle? (y/n): ")
+        except EOFError:
+            return
+    else:
+        choice = sys.stdin.readline()
+        if not choice:  # порожній рядок повертається лише на EOF
+            return
+    choice = choice.strip().lower()
     if choice.startswith("y"):
         address_book = load_data(PICKLE_FILE)
     else:
+        # нова книга не веде журнал до свого першого знімка: журнал попередньої книги
+        # (і сам її знімок) лишаються недоторканими, доки save_data не збереже нову
         address_book = AddressBook()
         print("Створено нову (порожню) адресну книгу.")
 
-    COMMANDS = {
-        "add": add_contact,
-        "change": change_phone,
-        "phone": show_phones,
-        "all": show_all,
-        "add-birthday": add_birthday,
-        "show-birthday": show_birthday,
-        "birthdays": show_upcoming_birthdays,
-        "hello": greet
-    }
-
     print("Вітаю! Це бот адресної книги. Наберіть 'help' для перегляду списку команд.")
 
-    while True:
-        user_input = input(">>> ").strip()
+    for user_input in read_commands(interactive):
+        user_input = user_input.strip()
         if not user_input:
             continue
-        parts = user_input.split()
+        # команду відокремлюємо одразу (по будь-якому пробільному символу),
+        # а аргументи розбирає сам обробник
+        parts = user_input.split(None, 1)
         command = parts[0].lower()
-        args = parts[1:]
+        args = parts[1] if len(parts) > 1 else ""
 
-        if command in ("exit", "close"):
-            print("До побачення! Зберігаю книгу...")
-            save_data(address_book, PICKLE_FILE)
+        handler = COMMANDS.get(command)
+        if handler is None:
+            print(MSG_UNKNOWN_COMMAND)
+            continue
+        result = handler(args, address_book)
+        if result is not None:
+            print(result)
+        if handler is close_book:
             break
-        elif command == "help":
-            print(Fore.YELLOW + "Підтримувані команди:\n" + Style.RESET_ALL +
-                  "  hello\n"
-                  "  add [name] [phone]\n"
-                  "  change [name] [old_phone] [new_phone]\n"
-                  "  phone [name]\n"
-                  "  all\n"
-                  "  add-birthday [name] [DD.MM.YYYY]\n"
-                  "  show-birthday [name]\n"
-                  "  birthdays\n"
-                  "  close або exit (для завершення)\n")
-        elif command in COMMANDS:
-            handler = COMMANDS[command]
-            result = handler(args, address_book)
-            if result is not None:
-                print(result)
-        else:
-            print(Fore.CYAN + "Невідома команда. Спробуйте 'help' для перегляду доступних команд." + Style.RESET_ALL)
+    else:
+        # ввід скінчився без exit — зберігаємо так само, як при виході
+        close_book("", address_book)
 
 
 if __name__ == "__main__":